@@ -7,62 +7,160 @@ import streamlit as st
 import hashlib
 import functools
 import datetime
-import pdfplumber  # Using pdfplumber instead of PyMuPDF
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+import pypdfium2 as pdfium  # Fast text extraction; ~5-10x quicker than pdfplumber
 import ollama
-import httpx
-import feedparser
-import os
-from serpapi.google_search import GoogleSearch
-from jobs.search_api import fetch_google_jobs_serpapi, enhanced_jobicy_search
+import diskcache
+from search_api import fetch_google_jobs_serpapi, enhanced_jobicy_search
 # CRITICAL: set_page_config MUST be the very first Streamlit command
 st.set_page_config(page_title="AI Resume Analyzer + Job Finder", layout="wide")
 
-# ────────────────────────────────────────────────  CONFIG  ──────────────────────────────────────────────
-def get_serpapi_key():
-    """Get SERPAPI key from environment or Streamlit secrets"""
-    try:
-        return st.secrets.get("SERPAPI_KEY", os.getenv("SERPAPI_KEY"))
-    except Exception:
-        return os.getenv("SERPAPI_KEY")
-
 # ──────────────────── PDF ➞ TEXT (sanitised) ────────────────────
-def extract_text_from_pdf(upload, max_chars=60_000) -> str:
-    """Extract text from uploaded PDF file with sanitization."""
+# Bytes stripped during sanitization: everything outside printable ASCII
+# except tab/newline/carriage return. Built once so translate runs in C
+# instead of a per-character Python loop.
+_STRIP_BYTES = bytes(i for i in range(256) if not (31 < i < 127 or i in (9, 10, 13)))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def extract_text_from_pdf(data: bytes, max_chars=60_000) -> str:
+    """Extract text from PDF bytes with sanitization."""
     try:
-        with pdfplumber.open(upload) as pdf:
+        pdf = pdfium.PdfDocument(data)
+        try:
             text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
+            for page in pdf:
+                remaining = max_chars - len(text)
+                if remaining <= 0:
+                    break
+                textpage = page.get_textpage()
+                # Only decode as many characters as the budget still allows,
+                # instead of extracting whole pages destined for truncation.
+                count = min(remaining, textpage.count_chars())
+                page_text = textpage.get_text_range(0, count) if count > 0 else ""
+                textpage.close()
+                page.close()
                 if page_text:
                     text += page_text + "\n"
-                if len(text) >= max_chars:
-                    break
             text = text[:max_chars]
-            return "".join(ch for ch in text if 31 < ord(ch) < 127 or ch in "\n\r\t")
+            return text.encode("ascii", "ignore").translate(None, _STRIP_BYTES).decode("ascii")
+        finally:
+            pdf.close()
     except Exception as e:
         print(f"PDF extraction error: {e}")
         return ""
 
 # ──────────────────── CACHED OLLAMA CALLS ────────────────────
+# On-disk response cache: lru_cache is per-process and dies on Streamlit
+# rerun, so repeat uploads of the same resume would re-run inference.
+_DISK = diskcache.Cache(".cache/ollama")
+
+
 @functools.lru_cache(maxsize=128)
-def _ollama(model: str, key: str, prompt: str) -> str:
-    """Cached Ollama chat completion call."""
+def _ollama(model: str, prompt: str, fmt: str = "") -> str:
+    """Cached Ollama chat completion call, keyed on the full prompt."""
+    key = hashlib.sha256((model + "\x00" + prompt + "\x00" + fmt).encode()).hexdigest()
+    try:
+        if key in _DISK:
+            return _DISK[key]
+    except Exception:
+        pass
     try:
-        response = ollama.chat(model=model, messages=[{"role": "user", "content": prompt}])
-        return response["message"]["content"]
+        response = ollama.chat(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            format=fmt,
+        )
+        content = response["message"]["content"]
     except Exception as e:
         print(f"Ollama error: {e}")
         return ""
+    if content:
+        try:
+            _DISK[key] = content
+        except Exception:
+            pass
+    return content
+
+def ask_ollama(model: str, prompt: str, resume_hash: str, fmt: str = "") -> str:
+    """Ask Ollama with memoization on (model, prompt).
 
-def ask_ollama(model: str, prompt: str, resume_hash: str) -> str:
-    """Ask Ollama with caching based on resume hash."""
+    resume_hash is kept in the signature as an explicit cache discriminator
+    for callers, but the memoization key is the full prompt — a truncated
+    prompt prefix would collide across prompt types that share a preamble.
+    """
     try:
-        return _ollama(model, resume_hash + prompt[:40], prompt)
+        return _ollama(model, prompt, fmt)
     except Exception as e:
         print(f"Ollama not available: {e}")
         return ""
 
+def ask_ollama_stream(model: str, prompt: str, fmt: str = ""):
+    """Yield response chunks from Ollama as they are generated.
+
+    A disk-cache hit is replayed as a single chunk; otherwise the streamed
+    response is committed to the cache once the generator is exhausted, so
+    later non-streaming lookups for the same prompt are free.
+    """
+    key = hashlib.sha256((model + "\x00" + prompt + "\x00" + fmt).encode()).hexdigest()
+    try:
+        if key in _DISK:
+            yield _DISK[key]
+            return
+    except Exception:
+        pass
+    parts: list[str] = []
+    try:
+        for part in ollama.chat(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            format=fmt,
+            stream=True,
+        ):
+            chunk = part["message"]["content"]
+            parts.append(chunk)
+            yield chunk
+    except Exception as e:
+        print(f"Ollama error: {e}")
+        return
+    text = "".join(parts)
+    if text:
+        try:
+            _DISK[key] = text
+        except Exception:
+            pass
+
 # ──────────────────── AI-POWERED JOB ROLE DETECTION ────────────────────
+# One compiled pattern pulls every labelled field out of the structured
+# response in a single pass, replacing per-line startswith/replace chains.
+_FIELD_RE = re.compile(
+    r"^(PRIMARY ROLE|ALTERNATIVE ROLES|CAREER LEVEL|KEY STRENGTHS|RECOMMENDED KEYWORDS):\s*(.*)$",
+    re.M,
+)
+_FIELD_MAP = {
+    "PRIMARY ROLE": "primary_role",
+    "ALTERNATIVE ROLES": "alternative_roles",
+    "CAREER LEVEL": "career_level",
+    "KEY STRENGTHS": "key_strengths",
+    "RECOMMENDED KEYWORDS": "recommended_keywords",
+}
+_LIST_FIELDS = {"alternative_roles", "key_strengths", "recommended_keywords"}
+
+# Read-only defaults template shared by the analysis paths; list fields are
+# tuples so nothing can mutate the template through a returned dict.
+_DEFAULT_ROLES = MappingProxyType({
+    "primary_role": "Software Engineer",
+    "alternative_roles": ("Developer", "Programmer", "Engineer"),
+    "career_level": "Mid Level",
+    "key_strengths": ("Programming", "Problem Solving", "Technology"),
+    "recommended_keywords": ("software engineer", "developer", "programming"),
+})
+
+
+@st.cache_data(show_spinner=False)
 def detect_suitable_job_roles(resume_text: str, resume_hash: str) -> dict:
     """Use Ollama AI to intelligently detect suitable job roles for the user."""
     
@@ -93,140 +191,147 @@ def detect_suitable_job_roles(resume_text: str, resume_hash: str) -> dict:
     """
     
     response = ask_ollama("mistral", role_detection_prompt, resume_hash)
-    
+
     # Parse the structured response
-    parsed_roles = {
-        "primary_role": "Software Engineer",
-        "alternative_roles": ["Developer", "Programmer", "Engineer"],
-        "career_level": "Mid Level",
-        "key_strengths": ["Programming", "Problem Solving", "Technology"],
-        "recommended_keywords": ["software engineer", "developer", "programming"]
-    }
-    
+    parsed_roles: dict = {}
+
     if response:
-        lines = response.split('\n')
-        for line in lines:
-            if line.startswith('PRIMARY ROLE:'):
-                parsed_roles["primary_role"] = line.replace('PRIMARY ROLE:', '').strip()
-            elif line.startswith('ALTERNATIVE ROLES:'):
-                alt_roles = line.replace('ALTERNATIVE ROLES:', '').strip()
-                parsed_roles["alternative_roles"] = [role.strip() for role in alt_roles.split(',')]
-            elif line.startswith('CAREER LEVEL:'):
-                parsed_roles["career_level"] = line.replace('CAREER LEVEL:', '').strip()
-            elif line.startswith('KEY STRENGTHS:'):
-                strengths = line.replace('KEY STRENGTHS:', '').strip()
-                parsed_roles["key_strengths"] = [strength.strip() for strength in strengths.split(',')]
-            elif line.startswith('RECOMMENDED KEYWORDS:'):
-                keywords = line.replace('RECOMMENDED KEYWORDS:', '').strip()
-                parsed_roles["recommended_keywords"] = [keyword.strip() for keyword in keywords.split(',')]
-    
+        for m in _FIELD_RE.finditer(response):
+            field = _FIELD_MAP[m.group(1)]
+            value = m.group(2).strip()
+            if field in _LIST_FIELDS:
+                parsed_roles[field] = [item.strip() for item in value.split(',')]
+            else:
+                parsed_roles[field] = value
+
+    # Fill only the fields the model didn't provide from the shared template.
+    for field, default in _DEFAULT_ROLES.items():
+        if not parsed_roles.get(field):
+            parsed_roles[field] = list(default) if field in _LIST_FIELDS else default
+
     return parsed_roles
 
-# ──────────── PROPER SERPAPI GOOGLE JOBS IMPLEMENTATION ────────────
-def fetch_google_jobs_serpapi(detected_roles: dict, location: str = "Remote", limit: int = 15):
-    """Fetch jobs using proper SerpAPI Google Jobs API implementation."""
-    api_key = get_serpapi_key()
-    if not api_key:
-        print("SERPAPI_KEY not set. Skipping Google Jobs search.")
-        return []
-    
-    all_jobs = []
-    
-    # Create search queries based on AI recommendations
-    search_queries = [
-        detected_roles["primary_role"],
-        f"{detected_roles['primary_role']} {detected_roles['career_level'].lower()}",
-    ]
-    
-    # Add alternative roles and keywords
-    search_queries.extend(detected_roles["alternative_roles"][:2])
-    search_queries.extend(detected_roles["recommended_keywords"][:2])
-    
-    for query in search_queries:
-        if len(all_jobs) >= limit:
-            break
-            
-        # Proper SerpAPI Google Jobs parameters based on documentation[1][2]
-        params = {
-            "engine": "google_jobs",           # Required: Set to google_jobs
-            "q": f"{query} remote",            # Search query
-            "location": location,              # Geographic location
-            "hl": "en",                       # Language (English)
-            "gl": "us",                       # Country (US)
-            "api_key": api_key,               # Your SerpAPI key
-            "no_cache": False                 # Allow cached results for faster response
-        }
-        
-        try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            
-            # Check for errors in response
-            if 'error' in results:
-                print(f"SerpAPI Error: {results['error']}")
-                continue
-            
-            jobs_results = results.get("jobs_results", [])
-            
-            for job in jobs_results:
-                if len(all_jobs) >= limit:
-                    break
-                
-                # Extract job data according to SerpAPI response structure[6]
-                job_data = {
-                    "title": job.get("title"),
-                    "company": job.get("company_name"),
-                    "location": job.get("location"),
-                    "link": job.get("related_links", [{}])[0].get("link") if job.get("related_links") else None,
-                    "posted": job.get("detected_extensions", {}).get("posted_at"),
-                    "schedule_type": job.get("detected_extensions", {}).get("schedule_type"),
-                    "via": job.get("via"),
-                    "job_id": job.get("job_id"),
-                    "thumbnail": job.get("thumbnail"),
-                    "description": job.get("description"),
-                    "match_reason": f"Matches: {query}"
-                }
-                
-                # Avoid duplicates
-                if not any(existing_job["title"] == job_data["title"] and 
-                         existing_job["company"] == job_data["company"] 
-                         for existing_job in all_jobs):
-                    all_jobs.append(job_data)
-            
-        except Exception as e:
-            print(f"Google Jobs fetch failed for query '{query}': {e}")
-            continue
-    
-    return all_jobs
+# ──────────────────── COMBINED RESUME ANALYSIS ────────────────────
+def _analysis_prompt(resume_text: str) -> str:
+    """Prompt for the single JSON-formatted analysis request.
 
-# ──────────── FALLBACK SOURCES WITH AI KEYWORDS ────────────
-def enhanced_jobicy_search(detected_roles: dict, limit: int = 10):
-    """Search Jobicy using AI-detected keywords."""
-    try:
-        data = httpx.get("https://jobs.jobicy.com/api/v2/remote-jobs", timeout=15).json().get("jobs", [])
-        cutoff = datetime.date.today() - datetime.timedelta(days=30)
-        
-        # Use AI-recommended keywords for better matching
-        search_terms = [detected_roles["primary_role"]] + detected_roles["recommended_keywords"]
-        
-        matched_jobs = []
-        for job in data:
-            job_date = datetime.date.fromisoformat(job["published_at"][:10])
-            if job_date >= cutoff:
-                for term in search_terms:
-                    if term.lower() in job["title"].lower() or term.lower() in job.get("description", "").lower():
-                        matched_jobs.append({
-                            "url": job["url"],
-                            "title": job["title"],
-                            "company": job.get("company_name", "Unknown"),
-                            "match_reason": f"Matches: {term}"
-                        })
+    "summary" is deliberately the first key so a streamed response can render
+    the summary while the rest of the JSON is still being generated.
+    """
+    return f"""
+    Analyze this resume. Consider the person's skills and technologies, work
+    experience and career progression, education and certifications, projects,
+    achievements and industry experience.
+
+    Respond ONLY with a JSON object with exactly these keys, in this order:
+    {{
+      "summary": "concise professional summary highlighting key qualifications and experience",
+      "primary_role": "the single best-fitting job title to target",
+      "alternative_roles": ["3-4 other suitable job titles"],
+      "career_level": "Entry/Mid/Senior level assessment",
+      "key_strengths": ["top 3 skills or areas"],
+      "recommended_keywords": ["best search terms for job hunting"]
+    }}
+
+    Resume content:
+    {resume_text}
+    """
+
+
+_SUMMARY_OPEN_RE = re.compile(r'"summary"\s*:\s*"')
+
+_JSON_UNESCAPE = {
+    '"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f",
+    "n": "\n", "r": "\r", "t": "\t",
+}
+
+
+def _iter_summary(chunks):
+    """Incrementally yield the "summary" string out of a streamed JSON reply.
+
+    Escape sequences are decoded on the fly and output stops at the closing
+    quote, so st.write_stream can render the summary at first-token latency.
+    The source iterator is drained to the end either way, letting callers tee
+    off the full response for structured parsing afterwards.
+    """
+    buf = ""
+    inside = False
+    for chunk in chunks:
+        buf += chunk
+        if not inside:
+            m = _SUMMARY_OPEN_RE.search(buf)
+            if m is None:
+                continue
+            buf = buf[m.end():]
+            inside = True
+        out: list[str] = []
+        i = 0
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                if out:
+                    yield "".join(out)
+                for _ in chunks:  # drain so the tee sees the whole response
+                    pass
+                return
+            if ch == "\\":
+                if i + 1 >= len(buf):
+                    break  # escape split across chunks; wait for more input
+                nxt = buf[i + 1]
+                if nxt == "u":
+                    if i + 6 > len(buf):
                         break
-        
-        return matched_jobs[:limit]
-    except Exception as e:
-        print(f"Jobicy API error: {e}")
-        return []
+                    try:
+                        out.append(chr(int(buf[i + 2:i + 6], 16)))
+                    except ValueError:
+                        pass
+                    i += 6
+                    continue
+                out.append(_JSON_UNESCAPE.get(nxt, nxt))
+                i += 2
+                continue
+            out.append(ch)
+            i += 1
+        buf = buf[i:]
+        if out:
+            yield "".join(out)
+
+
+def analyze_resume(resume_text: str, resume_hash: str, response: str | None = None) -> dict:
+    """Summarise the résumé and detect suitable roles in a single Ollama call.
+
+    One JSON-formatted request replaces the former summary + role-detection
+    round-trips, halving HTTP overhead and letting Ollama reuse its prompt
+    cache across both answers. Callers that already streamed the response can
+    pass it in; falls back to the two-call path when the model returns
+    something unparseable.
+    """
+
+    if response is None:
+        response = ask_ollama("mistral", _analysis_prompt(resume_text), resume_hash, fmt="json")
+    if response:
+        try:
+            payload = json.loads(response)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict) and payload.get("primary_role"):
+            return {
+                "summary": str(payload.get("summary", "")),
+                "primary_role": str(payload["primary_role"]),
+                "alternative_roles": [str(r) for r in payload.get("alternative_roles") or []]
+                or list(_DEFAULT_ROLES["alternative_roles"]),
+                "career_level": str(payload.get("career_level") or _DEFAULT_ROLES["career_level"]),
+                "key_strengths": [str(s) for s in payload.get("key_strengths") or []]
+                or list(_DEFAULT_ROLES["key_strengths"]),
+                "recommended_keywords": [str(k) for k in payload.get("recommended_keywords") or []]
+                or list(_DEFAULT_ROLES["recommended_keywords"]),
+            }
+
+    # Unparseable or Ollama unavailable: fall back to separate calls.
+    analysis = detect_suitable_job_roles(resume_text, resume_hash)
+    summary_prompt = f"Provide a concise professional summary of this résumé, highlighting key qualifications and experience:\n\n{resume_text}"
+    analysis["summary"] = ask_ollama("mistral", summary_prompt, resume_hash)
+    return analysis
 
 # ──────────────────── MAIN STREAMLIT APP ────────────────────
 st.title("🤖 AI-Powered Resume Analyzer + Smart Job Finder")
@@ -257,28 +362,34 @@ uploaded_file = st.file_uploader("📄 Upload your résumé (PDF only)", type=["
 
 if uploaded_file:
     with st.spinner("🧠 AI is analyzing your résumé..."):
-        resume_text = extract_text_from_pdf(uploaded_file)
+        # Pass raw bytes so pdfium avoids a temp-file roundtrip
+        resume_text = extract_text_from_pdf(uploaded_file.getvalue())
         if not resume_text:
             st.error("Could not extract text from PDF. Please try a different file.")
             st.stop()
 
-        rhash = hashlib.sha256(resume_text.encode()).hexdigest()
-        
-        # Generate summary
-        summary_prompt = f"Provide a concise professional summary of this résumé, highlighting key qualifications and experience:\n\n{resume_text}"
-        summary = ask_ollama("mistral", summary_prompt, rhash)
-        
-        # AI-powered role detection
-        detected_roles = detect_suitable_job_roles(resume_text, rhash)
-        
-        if not summary:
-            st.warning("Ollama not available. Using default analysis.")
-            summary = "AI analysis not available. Please install Ollama for enhanced resume analysis."
+        # BLAKE2b is faster than SHA-256 here and a 16-byte digest is plenty
+        # for a cache discriminator; the shorter key also halves key storage.
+        rhash = hashlib.blake2b(resume_text.encode(), digest_size=16).hexdigest()
 
-    # Display AI Analysis Results
+    # Summary + role detection in one streamed Ollama round-trip: the summary
+    # renders as tokens arrive, the full response is teed off for parsing.
     st.subheader("📄 Professional Summary")
-    st.markdown(summary)
-    
+    _chunks: list[str] = []
+
+    def _capture():
+        for chunk in ask_ollama_stream("mistral", _analysis_prompt(resume_text), fmt="json"):
+            _chunks.append(chunk)
+            yield chunk
+
+    st.write_stream(_iter_summary(_capture()))
+    detected_roles = analyze_resume(resume_text, rhash, response="".join(_chunks))
+    summary = detected_roles["summary"]
+
+    if not summary:
+        st.warning("Ollama not available. Using default analysis.")
+        st.markdown("AI analysis not available. Please install Ollama for enhanced resume analysis.")
+
     st.subheader("🎯 AI-Detected Suitable Job Roles")
     
     col1, col2 = st.columns([2, 1])
@@ -312,23 +423,24 @@ if uploaded_file:
         search_start_time = datetime.datetime.now()
         
         with st.spinner(f"🎯 AI is finding the best job matches using SerpAPI Google Jobs..."):
-            # AI-optimized Google Jobs search using proper SerpAPI
-            google_jobs = fetch_google_jobs_serpapi(detected_roles, final_location)
-            
+            # Google Jobs and the fallback sources are independent network
+            # calls — run them in parallel so the wait is max(A, B), not A + B.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                google_future = executor.submit(fetch_google_jobs_serpapi, detected_roles, final_location)
+                fallback_future = executor.submit(enhanced_jobicy_search, detected_roles)
+                google_jobs = google_future.result()
+                fallback_jobs = fallback_future.result()
+
             if google_jobs:
                 st.success(f"🎉 Found {len(google_jobs)} highly relevant job matches via SerpAPI!")
                 with st.expander("🌐 Google Jobs - SerpAPI Results", expanded=True):
                     _display_jobs(google_jobs)
-            
-            # Enhanced fallback search
-            with st.spinner("🔄 Searching additional sources..."):
-                fallback_jobs = enhanced_jobicy_search(detected_roles)
-                
-                if fallback_jobs:
-                    st.success(f"✨ Found {len(fallback_jobs)} additional opportunities!")
-                    with st.expander("🌟 Additional Job Opportunities", expanded=True):
-                        _display_jobs(fallback_jobs)
-            
+
+            if fallback_jobs:
+                st.success(f"✨ Found {len(fallback_jobs)} additional opportunities!")
+                with st.expander("🌟 Additional Job Opportunities", expanded=True):
+                    _display_jobs(fallback_jobs)
+
             # Search completion summary
             total_jobs = len(google_jobs) + len(fallback_jobs)
             search_time = (datetime.datetime.now() - search_start_time).total_seconds()
@@ -376,7 +488,7 @@ else:
         st.markdown("""
         **Installation:**
         ```
-        pip install streamlit pymupdf ollama httpx feedparser google-search-results
+        pip install -r requirements.txt
         ollama pull mistral
         ```
         
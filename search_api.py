@@ -4,19 +4,55 @@ All external API logic is kept here to keep app.py focused on UI/orchestration.
 """
 from __future__ import annotations
 
+import asyncio
 import datetime
 import os
 from typing import List, Dict
 
 import feedparser
 import httpx
-from serpapi.google_search import GoogleSearch
+
+try:  # optional: matches every keyword in one linear pass over the haystack
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:  # optional: 2-3x faster decoding of the large SerpAPI/Jobicy payloads
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads_response(resp: httpx.Response) -> dict:
+    """Decode a JSON response body, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
 
 __all__ = [
     "fetch_google_jobs_serpapi",
     "enhanced_jobicy_search",
 ]
 
+# Connection-pool settings shared by the async fetch helpers below; a pooled
+# client means concurrent requests reuse warm TCP/TLS connections instead of
+# paying the handshake per GET.
+_LIMITS = httpx.Limits(max_keepalive_connections=10, max_connections=20)
+_HEADERS = {"User-Agent": "resume-finder/1.0"}
+
+
+async def _fetch_all(urls: list[str], timeout: int = 15) -> list[httpx.Response | None]:
+    """GET every URL concurrently over one pooled client; failures come back as None."""
+
+    async def _one(client: httpx.AsyncClient, url: str) -> httpx.Response | None:
+        try:
+            return await client.get(url)
+        except Exception:
+            return None
+
+    async with httpx.AsyncClient(limits=_LIMITS, headers=_HEADERS, timeout=timeout) as client:
+        return list(await asyncio.gather(*(_one(client, u) for u in urls)))
+
 # ---------------------------------------------------------------------------
 # Configuration helpers
 # ---------------------------------------------------------------------------
@@ -38,6 +74,30 @@ def _get_serpapi_key() -> str | None:
 # Google Jobs – SerpAPI implementation
 # ---------------------------------------------------------------------------
 
+_SERPAPI_URL = "https://serpapi.com/search.json"
+
+# Intra-day memo of raw per-query SerpAPI responses keyed by
+# (query, location, ISO date): repeat searches within a session re-issued
+# the same queries and burned quota for identical results.
+_QUERY_CACHE: dict[tuple[str, str, str], dict] = {}
+_QUERY_CACHE_MAX = 256
+
+
+async def _fetch_one(client: httpx.AsyncClient, params: dict) -> dict:
+    """GET a single SerpAPI query; failures return {} so one bad query can't sink the batch."""
+    try:
+        resp = await client.get(_SERPAPI_URL, params=params)
+        return _loads_response(resp)
+    except Exception:
+        return {}
+
+
+async def _gather_all(params_list: list[dict]) -> list[dict]:
+    """Run all SerpAPI queries concurrently over one pooled client."""
+    async with httpx.AsyncClient(limits=_LIMITS, headers=_HEADERS, timeout=20) as client:
+        return list(await asyncio.gather(*(_fetch_one(client, p) for p in params_list)))
+
+
 def fetch_google_jobs_serpapi(
     detected_roles: Dict[str, list | str],
     location: str = "Remote",
@@ -66,12 +126,18 @@ def fetch_google_jobs_serpapi(
     queries.extend(detected_roles.get("alternative_roles", [])[:2])
     queries.extend(detected_roles.get("recommended_keywords", [])[:2])
 
-    all_jobs: list[Dict[str, str]] = []
-
-    for query in filter(None, queries):
-        if len(all_jobs) >= limit:
-            break
+    queries = [q for q in queries if q]
+    date_key = datetime.date.today().isoformat()
 
+    # Serve repeats from the intra-day cache; build params only for misses,
+    # then fire the remaining queries concurrently — the path is
+    # network-bound, so wall time collapses to roughly one RTT.
+    results: list[dict | None] = []
+    to_fetch: list[tuple[int, dict]] = []
+    for pos, query in enumerate(queries):
+        results.append(_QUERY_CACHE.get((query, location, date_key)))
+        if results[pos] is not None:
+            continue
         params = {
             "engine": "google_jobs",
             "q": f"{query} remote",
@@ -83,38 +149,55 @@ def fetch_google_jobs_serpapi(
         # Only include location if not set to 'Remote' to avoid unsupported error
         if location.strip().lower() != "remote":
             params["location"] = location
-        try:
-            res = GoogleSearch(params).get_dict()
-            if "error" in res:  # quota errors, etc.
-                continue
-            for job in res.get("jobs_results", []):
-                if len(all_jobs) >= limit:
-                    break
-                                # Prefer original listing link; fall back to any available URL so the UI always has something clickable.
-                link = (
-                    (job.get("related_links") or [{}])[0].get("link")
-                    or job.get("apply_options", [{}])[0].get("link")
-                    or job.get("search_link")
-                    or job.get("apply_link")
-                    or job.get("link")
-                )
+        to_fetch.append((pos, params))
 
-                jd = {
-                    "title": job.get("title"),
-                    "company": job.get("company_name"),
-                    "location": job.get("location"),
-                    "link": link,
-                    "posted": job.get("detected_extensions", {}).get("posted_at"),
-                    "schedule_type": job.get("detected_extensions", {}).get("schedule_type"),
-                    "via": job.get("via"),
-                    "match_reason": f"Matches: {query}",
-                }
-                if not any(
-                    jd["title"] == e["title"] and jd["company"] == e["company"] for e in all_jobs
-                ):
-                    all_jobs.append(jd)
+    if to_fetch:
+        try:
+            fetched = asyncio.run(_gather_all([p for _, p in to_fetch]))
         except Exception:
+            fetched = [{} for _ in to_fetch]
+        for (pos, _), res in zip(to_fetch, fetched):
+            results[pos] = res
+            if res and "error" not in res:  # don't pin failures for the day
+                if len(_QUERY_CACHE) >= _QUERY_CACHE_MAX:
+                    _QUERY_CACHE.pop(next(iter(_QUERY_CACHE)))
+                _QUERY_CACHE[(queries[pos], location, date_key)] = res
+
+    all_jobs: list[Dict[str, str]] = []
+    seen: set[tuple[str, str]] = set()
+
+    for query, res in zip(queries, results):
+        if len(all_jobs) >= limit:
+            break
+        if "error" in res:  # quota errors, etc.
             continue
+        for job in res.get("jobs_results", []):
+            if len(all_jobs) >= limit:
+                break
+            # Prefer original listing link; fall back to any available URL so the UI always has something clickable.
+            link = (
+                (job.get("related_links") or [{}])[0].get("link")
+                or job.get("apply_options", [{}])[0].get("link")
+                or job.get("search_link")
+                or job.get("apply_link")
+                or job.get("link")
+            )
+
+            jd = {
+                "title": job.get("title"),
+                "company": job.get("company_name"),
+                "location": job.get("location"),
+                "link": link,
+                "posted": job.get("detected_extensions", {}).get("posted_at"),
+                "schedule_type": job.get("detected_extensions", {}).get("schedule_type"),
+                "via": job.get("via"),
+                "match_reason": f"Matches: {query}",
+            }
+            key = (jd["title"], jd["company"])
+            if key in seen:
+                continue
+            seen.add(key)
+            all_jobs.append(jd)
 
     return all_jobs[:limit]
 
@@ -128,55 +211,99 @@ _RSS_FEEDS = [
 ]
 
 
+def _build_matcher(terms: list[str]):
+    """Return a callable mapping lowercase text to the first matching term.
+
+    With pyahocorasick installed, all terms are matched in a single linear
+    scan of the haystack; otherwise we fall back to one substring scan per
+    term. Either way the callable returns the matched term or None.
+    """
+    terms = [t for t in terms if t]
+    if not terms:
+        return lambda hay: None
+
+    if ahocorasick is not None:
+        auto = ahocorasick.Automaton()
+        for t in terms:
+            auto.add_word(t.lower(), t)
+        auto.make_automaton()
+
+        def match(hay: str):
+            for _, term in auto.iter(hay):
+                return term
+            return None
+    else:
+        lowered = [(t.lower(), t) for t in terms]
+
+        def match(hay: str):
+            for lt, t in lowered:
+                if lt in hay:
+                    return t
+            return None
+
+    return match
+
+
 def enhanced_jobicy_search(detected_roles: Dict[str, list | str], limit: int = 10):
     """Search Jobicy and RSS feeds using AI-recommended keywords."""
 
     search_terms: list[str] = [str(detected_roles.get("primary_role", ""))]
     search_terms.extend(detected_roles.get("recommended_keywords", []) or [])
+    match = _build_matcher(search_terms)
 
     matched: list[Dict[str, str]] = []
 
-    # Jobicy API
+    # Fetch Jobicy JSON and all RSS feeds in one gather so their latencies
+    # overlap; parsing below stays synchronous and order-stable.
     try:
-        data = (
-            httpx.get("https://jobs.jobicy.com/api/v2/remote-jobs", timeout=15)
-            .json()
-            .get("jobs", [])
+        responses = asyncio.run(
+            _fetch_all(["https://jobs.jobicy.com/api/v2/remote-jobs", *_RSS_FEEDS])
         )
+    except Exception:
+        return []
+    jobicy_resp, feed_resps = responses[0], responses[1:]
+
+    # Jobicy API
+    try:
+        data = _loads_response(jobicy_resp).get("jobs", []) if jobicy_resp is not None else []
         cutoff = datetime.date.today() - datetime.timedelta(days=30)
         for job in data:
             pub = datetime.date.fromisoformat(job["published_at"][:10])
             if pub < cutoff:
                 continue
             content = (job.get("title", "") + " " + job.get("description", "")).lower()
-            for term in search_terms:
-                if term.lower() in content:
-                    matched.append(
-                        {
-                            "url": job["url"],
-                            "title": job["title"],
-                            "company": job.get("company_name", "Unknown"),
-                            "match_reason": f"Matches: {term}",
-                        }
-                    )
-                    break
+            term = match(content)
+            if term:
+                matched.append(
+                    {
+                        "url": job["url"],
+                        "title": job["title"],
+                        "company": job.get("company_name", "Unknown"),
+                        "match_reason": f"Matches: {term}",
+                    }
+                )
     except Exception:
         pass
 
     # RSS feeds fallback
     try:
-        cutoff = datetime.date.today() - datetime.timedelta(days=30)
-        for rss in _RSS_FEEDS:
-            feed = feedparser.parse(rss)
+        cutoff_ordinal = (datetime.date.today() - datetime.timedelta(days=30)).toordinal()
+        for resp in feed_resps:
+            if resp is None:
+                continue
+            # Hand feedparser the already-fetched bytes so it skips its own
+            # one-shot urllib fetcher.
+            feed = feedparser.parse(resp.content)
             for entry in feed.entries:
-                pub_dt = datetime.datetime.strptime(entry.published, "%a, %d %b %Y %H:%M:%S %z").date()
-                if pub_dt < cutoff:
+                # feedparser has already parsed the date; no strptime needed.
+                published = entry.get("published_parsed")
+                if not published:
+                    continue
+                if datetime.date(*published[:3]).toordinal() < cutoff_ordinal:
                     continue
-                title_lower = entry.title.lower()
-                for term in search_terms:
-                    if term.lower() in title_lower:
-                        matched.append({"url": entry.link, "title": entry.title, "company": "Remote", "match_reason": f"Matches: {term}"})
-                        break
+                term = match(entry.title.lower())
+                if term:
+                    matched.append({"url": entry.link, "title": entry.title, "company": "Remote", "match_reason": f"Matches: {term}"})
     except Exception:
         pass
 